@@ -1,777 +1,958 @@
-from pyswip import Prolog
-
-class FamilyRelationshipChatbot:
-    """
-    A conversational chatbot that understands family relationships using Prolog inference.
-    Follows the exact specifications for family relationship statements and questions.
-    """
-    
-    def __init__(self, knowledge_base_file):
-        """
-        Initialize the chatbot with a Prolog knowledge base.
-        
-        Args:
-            knowledge_base_file (str): Path to the Prolog knowledge base file
-        """
-        self.prolog_engine = Prolog()
-        self.prolog_engine.consult(knowledge_base_file)
-
-    def _extract_names_from_statement(self, statement, relationship_phrase):
-        """
-        Extract two names from a relationship statement.
-        
-        Args:
-            statement (str): The input statement
-            relationship_phrase (str): The relationship phrase to split on
-            
-        Returns:
-            tuple: Two names extracted from the statement
-        """
-        parts = statement.split(relationship_phrase)
-        first_name = parts[0].strip().rstrip('.').lower().capitalize()
-        second_name = parts[1].strip().rstrip('.').lower().capitalize()
-        return first_name, second_name
-
-    def _is_fact_provable(self, fact_query):
-        """
-        Check if a fact can be proven from the current knowledge base.
-        
-        Args:
-            fact_query (str): Prolog query to check
-            
-        Returns:
-            bool: True if the fact is provable, False otherwise
-        """
-        try:
-            results = list(self.prolog_engine.query(fact_query))
-            return bool(results)
-        except Exception:
-            return False
-
-    def _has_gender_conflict(self, person_name, expected_gender):
-        """
-        Check if assigning a gender to a person conflicts with existing knowledge.
-        
-        Args:
-            person_name (str): Name of the person
-            expected_gender (str): Gender to check ('male' or 'female')
-            
-        Returns:
-            bool: True if there's a conflict, False otherwise
-        """
-        opposite_gender = 'female' if expected_gender == 'male' else 'male'
-        return self._is_fact_provable(f"{opposite_gender}({person_name.lower()})")
-
-    def _are_persons_related(self, person1, person2):
-        """
-        Check if two persons are already related in the knowledge base.
-        
-        Args:
-            person1 (str): First person's name
-            person2 (str): Second person's name
-            
-        Returns:
-            bool: True if they are related, False otherwise
-        """
-        return self._is_fact_provable(f"related({person1.lower()}, {person2.lower()})")
-
-    def _would_create_circular_relationship(self, child, parent):
-        """
-        Check if a parent-child relationship would create circular dependency.
-        
-        Args:
-            child (str): Child's name
-            parent (str): Parent's name
-            
-        Returns:
-            bool: True if it would create circular relationship, False otherwise
-        """
-        # Check if parent is already a descendant of child
-        return self._are_persons_related(parent, child)
-
-    def _would_create_invalid_parent_child_relationship(self, child, parent):
-        """
-        Check if a parent-child relationship would create logical inconsistencies.
-        This is more specific than circular relationship check - it allows consistent
-        assertions but prevents true logical conflicts.
-        
-        Args:
-            child (str): Child's name
-            parent (str): Parent's name
-            
-        Returns:
-            bool: True if it would create invalid relationship, False otherwise
-        """
-        # Check if child is already a parent/ancestor of the proposed parent
-        is_child_ancestor_of_parent = (
-            self._is_fact_provable(f"parent({child.lower()}, {parent.lower()})") or
-            self._is_fact_provable(f"grandparent({child.lower()}, {parent.lower()})")
-        )
-        
-        # If the parent-child relationship already exists, it's consistent
-        existing_relationship = self._is_fact_provable(f"parent({parent.lower()}, {child.lower()})")
-        
-        # Only invalid if child is ancestor of parent (and they're not already parent-child)
-        return is_child_ancestor_of_parent and not existing_relationship
-
-    def _would_create_invalid_sibling_relationship(self, person1, person2):
-        """
-        Check if a sibling relationship would create logical inconsistencies.
-        For siblings, we only check for direct ancestor-descendant relationships,
-        not general relatedness (since siblings can be related in other ways).
-        
-        Args:
-            person1 (str): First person's name
-            person2 (str): Second person's name
-            
-        Returns:
-            bool: True if it would create invalid relationship, False otherwise
-        """
-        # Check if one is an ancestor/descendant of the other
-        is_parent_child = (self._is_fact_provable(f"parent({person1.lower()}, {person2.lower()})") or
-                          self._is_fact_provable(f"parent({person2.lower()}, {person1.lower()})"))
-        
-        # Check if one is a grandparent/grandchild of the other  
-        is_grandparent_grandchild = (self._is_fact_provable(f"grandparent({person1.lower()}, {person2.lower()})") or
-                                   self._is_fact_provable(f"grandparent({person2.lower()}, {person1.lower()})"))
-        
-        return is_parent_child or is_grandparent_grandchild
-
-    def _validate_multiple_children_statement(self, children_list, parent_name):
-        """
-        Validate that multiple children can be children of the given parent.
-        
-        Args:
-            children_list (list): List of children names
-            parent_name (str): Parent's name
-            
-        Returns:
-            bool: True if valid, False if conflicts exist
-        """
-        for child in children_list:
-            if (child.lower() == parent_name.lower() or 
-                self._would_create_circular_relationship(child, parent_name)):
-                return False
-        return True
-
-    def process_statement(self, user_statement):
-        """
-        Process a user statement and update the knowledge base if valid.
-        
-        Args:
-            user_statement (str): The statement provided by the user
-        """
-        statement = user_statement.strip()
-        
-        try:
-            # Handle sibling relationships - exact pattern: "[Name] and [Name] are siblings"
-            if " and " in statement and " are siblings" in statement:
-                self._process_siblings_statement(statement)
-            
-            # Handle parent relationships - exact pattern: "[Name] and [Name] are the parents of [Name]"
-            elif " and " in statement and " are the parents of " in statement:
-                self._process_parents_statement(statement)
-            
-            # Handle multiple children - pattern: "[Name], [Name] and [Name] are children of [Name]"
-            elif " are children of " in statement:
-                self._process_multiple_children_statement(statement)
-            
-            # Handle father relationship - exact pattern: "[Name] is the father of [Name]"
-            elif " is the father of " in statement:
-                self._process_father_statement(statement)
-            
-            # Handle mother relationship - exact pattern: "[Name] is the mother of [Name]"
-            elif " is the mother of " in statement:
-                self._process_mother_statement(statement)
-            
-            # Handle brother relationship - exact pattern: "[Name] is a brother of [Name]"
-            elif " is a brother of " in statement:
-                self._process_brother_statement(statement)
-            
-            # Handle sister relationship - exact pattern: "[Name] is a sister of [Name]"
-            elif " is a sister of " in statement:
-                self._process_sister_statement(statement)
-            
-            # Handle grandmother relationship - exact pattern: "[Name] is a grandmother of [Name]"
-            elif " is a grandmother of " in statement:
-                self._process_grandmother_statement(statement)
-            
-            # Handle grandfather relationship - exact pattern: "[Name] is a grandfather of [Name]"
-            elif " is a grandfather of " in statement:
-                self._process_grandfather_statement(statement)
-            
-            # Handle child relationship - exact pattern: "[Name] is a child of [Name]"
-            elif " is a child of " in statement:
-                self._process_child_statement(statement)
-            
-            # Handle daughter relationship - exact pattern: "[Name] is a daughter of [Name]"
-            elif " is a daughter of " in statement:
-                self._process_daughter_statement(statement)
-            
-            # Handle son relationship - exact pattern: "[Name] is a son of [Name]"
-            elif " is a son of " in statement:
-                self._process_son_statement(statement)
-            
-            # Handle aunt relationship - exact pattern: "[Name] is an aunt of [Name]"
-            elif " is an aunt of " in statement:
-                self._process_aunt_statement(statement)
-            
-            # Handle uncle relationship - exact pattern: "[Name] is an uncle of [Name]"
-            elif " is an uncle of " in statement:
-                self._process_uncle_statement(statement)
-            
-            else:
-                print("Invalid statement. Please follow the sentence patterns.")
-                
-        except Exception:
-            print("That's impossible!")
-
-    def _process_siblings_statement(self, statement):
-        """Process '[Name] and [Name] are siblings' statement."""
-        parts = statement.replace(" are siblings", "").split(" and ")
-        if len(parts) == 2:
-            person1 = parts[0].strip().rstrip('.').lower().capitalize()
-            person2 = parts[1].strip().rstrip('.').lower().capitalize()
-            
-            if person1.lower() == person2.lower():
-                print("That's impossible!")
-                return
-                
-            if self._would_create_invalid_sibling_relationship(person1, person2):
-                print("That's impossible!")
-                return
-                
-            self.prolog_engine.assertz(f"sibling({person1.lower()}, {person2.lower()})")
-            self.prolog_engine.assertz(f"sibling({person2.lower()}, {person1.lower()})")
-            print("OK! I learned something.")
-        else:
-            print("Invalid statement. Please follow the sentence patterns.")
-
-    def _process_parents_statement(self, statement):
-        """Process '[Name] and [Name] are the parents of [Name]' statement."""
-        modified_statement = statement.replace(" are the parents of ", " and ")
-        parts = modified_statement.split(" and ")
-        
-        if len(parts) == 3:
-            parent1 = parts[0].strip().rstrip('.').lower().capitalize()
-            parent2 = parts[1].strip().rstrip('.').lower().capitalize()
-            child = parts[2].strip().rstrip('.').lower().capitalize()
-            
-            # Validation checks
-            if (child.lower() == parent1.lower() or child.lower() == parent2.lower() or
-                self._would_create_circular_relationship(child, parent1) or
-                self._would_create_circular_relationship(child, parent2)):
-                print("That's impossible!")
-                return
-                
-            self.prolog_engine.assertz(f"parent({parent1.lower()}, {child.lower()})")
-            self.prolog_engine.assertz(f"parent({parent2.lower()}, {child.lower()})")
-            print("OK! I learned something.")
-        else:
-            print("Invalid statement. Please follow the sentence patterns.")
-
-    def _process_multiple_children_statement(self, statement):
-        """Process '[Name], [Name] and [Name] are children of [Name]' statement."""
-        parts = statement.replace(" are children of ", " and ").replace(", ", " and ").split(" and ")
-        
-        if len(parts) >= 2:
-            children = [child.strip().rstrip('.').lower().capitalize() for child in parts[:-1]]
-            parent = parts[-1].strip().rstrip('.').lower().capitalize()
-            
-            if not self._validate_multiple_children_statement(children, parent):
-                print("That's impossible!")
-                return
-                
-            for child in children:
-                self.prolog_engine.assertz(f"parent({parent.lower()}, {child.lower()})")
-            print("OK! I learned something.")
-        else:
-            print("Invalid statement. Please follow the sentence patterns.")
-
-    def _process_father_statement(self, statement):
-        """Process '[Name] is the father of [Name]' statement."""
-        father, child = self._extract_names_from_statement(statement, " is the father of ")
-        
-        if (father.lower() == child.lower() or
-            self._has_gender_conflict(father, 'male') or
-            self._would_create_circular_relationship(child, father)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"male({father.lower()})")
-        self.prolog_engine.assertz(f"parent({father.lower()}, {child.lower()})")
-        print("OK! I learned something.")
-
-    def _process_mother_statement(self, statement):
-        """Process '[Name] is the mother of [Name]' statement."""
-        mother, child = self._extract_names_from_statement(statement, " is the mother of ")
-        
-        if (mother.lower() == child.lower() or
-            self._has_gender_conflict(mother, 'female') or
-            self._would_create_circular_relationship(child, mother)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"female({mother.lower()})")
-        self.prolog_engine.assertz(f"parent({mother.lower()}, {child.lower()})")
-        print("OK! I learned something.")
-
-    def _process_brother_statement(self, statement):
-        """Process '[Name] is a brother of [Name]' statement."""
-        brother, sibling = self._extract_names_from_statement(statement, " is a brother of ")
-        
-        if (brother.lower() == sibling.lower() or
-            self._has_gender_conflict(brother, 'male') or
-            self._would_create_invalid_sibling_relationship(brother, sibling)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"male({brother.lower()})")
-        self.prolog_engine.assertz(f"sibling({brother.lower()}, {sibling.lower()})")
-        self.prolog_engine.assertz(f"sibling({sibling.lower()}, {brother.lower()})")
-        print("OK! I learned something.")
-
-    def _process_sister_statement(self, statement):
-        """Process '[Name] is a sister of [Name]' statement."""
-        sister, sibling = self._extract_names_from_statement(statement, " is a sister of ")
-        
-        if (sister.lower() == sibling.lower() or
-            self._has_gender_conflict(sister, 'female') or
-            self._would_create_invalid_sibling_relationship(sister, sibling)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"female({sister.lower()})")
-        self.prolog_engine.assertz(f"sibling({sister.lower()}, {sibling.lower()})")
-        self.prolog_engine.assertz(f"sibling({sibling.lower()}, {sister.lower()})")
-        print("OK! I learned something.")
-
-    def _process_grandmother_statement(self, statement):
-        """Process '[Name] is a grandmother of [Name]' statement."""
-        grandmother, grandchild = self._extract_names_from_statement(statement, " is a grandmother of ")
-        
-        if (grandmother.lower() == grandchild.lower() or
-            self._has_gender_conflict(grandmother, 'female') or
-            self._would_create_circular_relationship(grandchild, grandmother)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"female({grandmother.lower()})")
-        self.prolog_engine.assertz(f"grandparent({grandmother.lower()}, {grandchild.lower()})")
-        print("OK! I learned something.")
-
-    def _process_grandfather_statement(self, statement):
-        """Process '[Name] is a grandfather of [Name]' statement."""
-        grandfather, grandchild = self._extract_names_from_statement(statement, " is a grandfather of ")
-        
-        if (grandfather.lower() == grandchild.lower() or
-            self._has_gender_conflict(grandfather, 'male') or
-            self._would_create_circular_relationship(grandchild, grandfather)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"male({grandfather.lower()})")
-        self.prolog_engine.assertz(f"grandparent({grandfather.lower()}, {grandchild.lower()})")
-        print("OK! I learned something.")
-
-    def _process_child_statement(self, statement):
-        """Process '[Name] is a child of [Name]' statement."""
-        child, parent = self._extract_names_from_statement(statement, " is a child of ")
-        
-        if (child.lower() == parent.lower() or
-            self._would_create_invalid_parent_child_relationship(child, parent)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"parent({parent.lower()}, {child.lower()})")
-        print("OK! I learned something.")
-
-    def _process_daughter_statement(self, statement):
-        """Process '[Name] is a daughter of [Name]' statement."""
-        daughter, parent = self._extract_names_from_statement(statement, " is a daughter of ")
-        
-        if (daughter.lower() == parent.lower() or
-            self._has_gender_conflict(daughter, 'female') or
-            self._would_create_invalid_parent_child_relationship(daughter, parent)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"female({daughter.lower()})")
-        self.prolog_engine.assertz(f"parent({parent.lower()}, {daughter.lower()})")
-        print("OK! I learned something.")
-
-    def _process_son_statement(self, statement):
-        """Process '[Name] is a son of [Name]' statement."""
-        son, parent = self._extract_names_from_statement(statement, " is a son of ")
-        
-        if (son.lower() == parent.lower() or
-            self._has_gender_conflict(son, 'male') or
-            self._would_create_invalid_parent_child_relationship(son, parent)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"male({son.lower()})")
-        self.prolog_engine.assertz(f"parent({parent.lower()}, {son.lower()})")
-        print("OK! I learned something.")
-
-    def _process_aunt_statement(self, statement):
-        """Process '[Name] is an aunt of [Name]' statement."""
-        aunt, niece_or_nephew = self._extract_names_from_statement(statement, " is an aunt of ")
-        
-        if (aunt.lower() == niece_or_nephew.lower() or
-            self._has_gender_conflict(aunt, 'female') or
-            self._would_create_circular_relationship(niece_or_nephew, aunt)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"female({aunt.lower()})")
-        self.prolog_engine.assertz(f"pibling({aunt.lower()}, {niece_or_nephew.lower()})")
-        print("OK! I learned something.")
-
-    def _process_uncle_statement(self, statement):
-        """Process '[Name] is an uncle of [Name]' statement."""
-        uncle, niece_or_nephew = self._extract_names_from_statement(statement, " is an uncle of ")
-        
-        if (uncle.lower() == niece_or_nephew.lower() or
-            self._has_gender_conflict(uncle, 'male') or
-            self._would_create_circular_relationship(niece_or_nephew, uncle)):
-            print("That's impossible!")
-            return
-            
-        self.prolog_engine.assertz(f"male({uncle.lower()})")
-        self.prolog_engine.assertz(f"pibling({uncle.lower()}, {niece_or_nephew.lower()})")
-        print("OK! I learned something.")
-
-    def process_question(self, user_question):
-        """
-        Process a user question and provide an appropriate answer.
-        
-        Args:
-            user_question (str): The question provided by the user
-        """
-        question = user_question.strip()
-        
-        try:
-            # Yes/No questions - exact patterns from specifications
-            if question.startswith("Are ") and " siblings?" in question:
-                self._process_siblings_question(question)
-            elif question.startswith("Is ") and " a sister of " in question and question.endswith("?"):
-                self._process_sister_question(question)
-            elif question.startswith("Is ") and " a brother of " in question and question.endswith("?"):
-                self._process_brother_question(question)
-            elif question.startswith("Is ") and " the mother of " in question and question.endswith("?"):
-                self._process_mother_question(question)
-            elif question.startswith("Is ") and " the father of " in question and question.endswith("?"):
-                self._process_father_question(question)
-            elif question.startswith("Are ") and " the parents of " in question and question.endswith("?"):
-                self._process_parents_question(question)
-            elif question.startswith("Is ") and " a grandmother of " in question and question.endswith("?"):
-                self._process_grandmother_question(question)
-            elif question.startswith("Is ") and " a grandfather of " in question and question.endswith("?"):
-                self._process_grandfather_question(question)
-            elif question.startswith("Is ") and " a daughter of " in question and question.endswith("?"):
-                self._process_daughter_question(question)
-            elif question.startswith("Is ") and " a son of " in question and question.endswith("?"):
-                self._process_son_question(question)
-            elif question.startswith("Is ") and " a child of " in question and question.endswith("?"):
-                self._process_child_question(question)
-            elif question.startswith("Are ") and " children of " in question and question.endswith("?"):
-                self._process_multiple_children_question(question)
-            elif question.startswith("Is ") and " an aunt of " in question and question.endswith("?"):
-                self._process_aunt_question(question)
-            elif question.startswith("Is ") and " an uncle of " in question and question.endswith("?"):
-                self._process_uncle_question(question)
-            elif question.startswith("Are ") and " relatives?" in question:
-                self._process_relatives_question(question)
-            
-            # Who questions - exact patterns from specifications  
-            elif question.startswith("Who are the siblings of ") and question.endswith("?"):
-                self._process_who_siblings_question(question)
-            elif question.startswith("Who are the sisters of ") and question.endswith("?"):
-                self._process_who_sisters_question(question)
-            elif question.startswith("Who are the brothers of ") and question.endswith("?"):
-                self._process_who_brothers_question(question)
-            elif question.startswith("Who is the mother of ") and question.endswith("?"):
-                self._process_who_mother_question(question)
-            elif question.startswith("Who is the father of ") and question.endswith("?"):
-                self._process_who_father_question(question)
-            elif question.startswith("Who are the parents of ") and question.endswith("?"):
-                self._process_who_parents_question(question)
-            elif question.startswith("Who are the daughters of ") and question.endswith("?"):
-                self._process_who_daughters_question(question)
-            elif question.startswith("Who are the sons of ") and question.endswith("?"):
-                self._process_who_sons_question(question)
-            elif question.startswith("Who are the children of ") and question.endswith("?"):
-                self._process_who_children_question(question)
-                
-            else:
-                print("Invalid question. Please follow the sentence patterns.")
-                
-        except Exception:
-            print("Invalid question. Please follow the sentence patterns.")
-
-    def _process_siblings_question(self, question):
-        """Process 'Are [Name] and [Name] siblings?' question."""
-        modified_question = question.replace("Are ", "").replace(" siblings?", "")
-        parts = modified_question.split(" and ")
-        
-        if len(parts) == 2:
-            person1 = parts[0].strip().lower().capitalize()
-            person2 = parts[1].strip().lower().capitalize()
-            result = self._is_fact_provable(f"sibling({person1.lower()}, {person2.lower()})")
-            print("Yes!" if result else "No!")
-        else:
-            print("Invalid question. Please follow the sentence patterns.")
-
-    def _process_sister_question(self, question):
-        """Process 'Is [Name] a sister of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        person1, person2 = self._extract_names_from_statement(modified_question, " a sister of ")
-        result = self._is_fact_provable(f"sister({person1.lower()}, {person2.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_brother_question(self, question):
-        """Process 'Is [Name] a brother of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        person1, person2 = self._extract_names_from_statement(modified_question, " a brother of ")
-        result = self._is_fact_provable(f"brother({person1.lower()}, {person2.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_mother_question(self, question):
-        """Process 'Is [Name] the mother of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        parent, child = self._extract_names_from_statement(modified_question, " the mother of ")
-        result = self._is_fact_provable(f"mother({parent.lower()}, {child.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_father_question(self, question):
-        """Process 'Is [Name] the father of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        parent, child = self._extract_names_from_statement(modified_question, " the father of ")
-        result = self._is_fact_provable(f"father({parent.lower()}, {child.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_parents_question(self, question):
-        """Process 'Are [Name] and [Name] the parents of [Name]?' question."""
-        modified_question = question.replace("Are ", "").replace(" the parents of ", " and ").replace("?", "")
-        parts = modified_question.split(" and ")
-        
-        if len(parts) == 3:
-            parent1 = parts[0].strip().lower()
-            parent2 = parts[1].strip().lower()
-            child = parts[2].strip().lower()
-            
-            result1 = self._is_fact_provable(f"parent({parent1}, {child})")
-            result2 = self._is_fact_provable(f"parent({parent2}, {child})")
-            print("Yes!" if (result1 and result2) else "No!")
-        else:
-            print("Invalid question. Please follow the sentence patterns.")
-
-    def _process_grandmother_question(self, question):
-        """Process 'Is [Name] a grandmother of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        grandparent, grandchild = self._extract_names_from_statement(modified_question, " a grandmother of ")
-        result = self._is_fact_provable(f"grandmother({grandparent.lower()}, {grandchild.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_grandfather_question(self, question):
-        """Process 'Is [Name] a grandfather of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        grandparent, grandchild = self._extract_names_from_statement(modified_question, " a grandfather of ")
-        result = self._is_fact_provable(f"grandfather({grandparent.lower()}, {grandchild.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_daughter_question(self, question):
-        """Process 'Is [Name] a daughter of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        child, parent = self._extract_names_from_statement(modified_question, " a daughter of ")
-        result = self._is_fact_provable(f"daughter({child.lower()}, {parent.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_son_question(self, question):
-        """Process 'Is [Name] a son of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        child, parent = self._extract_names_from_statement(modified_question, " a son of ")
-        result = self._is_fact_provable(f"son({child.lower()}, {parent.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_child_question(self, question):
-        """Process 'Is [Name] a child of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        child, parent = self._extract_names_from_statement(modified_question, " a child of ")
-        result = self._is_fact_provable(f"parent({parent.lower()}, {child.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_multiple_children_question(self, question):
-        """Process 'Are [Name], [Name] and [Name] children of [Name]?' question."""
-        modified_question = question.replace("Are ", "").replace(" children of ", " and ").replace("?", "").replace(", ", " and ")
-        parts = modified_question.split(" and ")
-        
-        if len(parts) >= 2:
-            children = [child.strip().lower() for child in parts[:-1]]
-            parent = parts[-1].strip().lower()
-            
-            all_children = all(self._is_fact_provable(f"parent({parent}, {child})") for child in children)
-            print("Yes!" if all_children else "No!")
-        else:
-            print("Invalid question. Please follow the sentence patterns.")
-
-    def _process_aunt_question(self, question):
-        """Process 'Is [Name] an aunt of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        aunt, niece_or_nephew = self._extract_names_from_statement(modified_question, " an aunt of ")
-        result = self._is_fact_provable(f"aunt({aunt.lower()}, {niece_or_nephew.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_uncle_question(self, question):
-        """Process 'Is [Name] an uncle of [Name]?' question."""
-        modified_question = question.replace("Is ", "").replace("?", "")
-        uncle, niece_or_nephew = self._extract_names_from_statement(modified_question, " an uncle of ")
-        result = self._is_fact_provable(f"uncle({uncle.lower()}, {niece_or_nephew.lower()})")
-        print("Yes!" if result else "No!")
-
-    def _process_relatives_question(self, question):
-        """Process 'Are [Name] and [Name] relatives?' question."""
-        modified_question = question.replace("Are ", "").replace(" relatives?", "")
-        parts = modified_question.split(" and ")
-        
-        if len(parts) == 2:
-            person1 = parts[0].strip().lower()
-            person2 = parts[1].strip().lower()
-            result = self._are_persons_related(person1, person2)
-            print("Yes!" if result else "No!")
-        else:
-            print("Invalid question. Please follow the sentence patterns.")
-
-    def _process_who_siblings_question(self, question):
-        """Process 'Who are the siblings of [Name]?' question."""
-        person = question.replace("Who are the siblings of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"sibling(X, {person})"))
-        
-        if results:
-            # Remove duplicates by converting to set and back to list
-            siblings = list(set([result['X'].capitalize() for result in results]))
-            siblings.sort()  # Sort for consistent output
-            print(f"The siblings of {person.capitalize()} are: {', '.join(siblings)}.")
-        else:
-            print(f"I don't know the siblings of {person.capitalize()}.")
-
-    def _process_who_sisters_question(self, question):
-        """Process 'Who are the sisters of [Name]?' question."""
-        person = question.replace("Who are the sisters of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"sister(X, {person})"))
-        
-        if results:
-            sisters = list(set([result['X'].capitalize() for result in results]))
-            sisters.sort()
-            print(f"The sisters of {person.capitalize()} are: {', '.join(sisters)}.")
-        else:
-            print(f"I don't know the sisters of {person.capitalize()}.")
-
-    def _process_who_brothers_question(self, question):
-        """Process 'Who are the brothers of [Name]?' question."""
-        person = question.replace("Who are the brothers of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"brother(X, {person})"))
-        
-        if results:
-            brothers = list(set([result['X'].capitalize() for result in results]))
-            brothers.sort()
-            print(f"The brothers of {person.capitalize()} are: {', '.join(brothers)}.")
-        else:
-            print(f"I don't know the brothers of {person.capitalize()}.")
-
-    def _process_who_mother_question(self, question):
-        """Process 'Who is the mother of [Name]?' question."""
-        child = question.replace("Who is the mother of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"mother(X, {child})"))
-        
-        if results:
-            mother = results[0]['X'].capitalize()
-            print(f"The mother of {child.capitalize()} is {mother}.")
-        else:
-            print(f"I don't know who the mother of {child.capitalize()} is.")
-
-    def _process_who_father_question(self, question):
-        """Process 'Who is the father of [Name]?' question."""
-        child = question.replace("Who is the father of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"father(X, {child})"))
-        
-        if results:
-            father = results[0]['X'].capitalize()
-            print(f"The father of {child.capitalize()} is {father}.")
-        else:
-            print(f"I don't know who the father of {child.capitalize()} is.")
-
-    def _process_who_parents_question(self, question):
-        """Process 'Who are the parents of [Name]?' question."""
-        child = question.replace("Who are the parents of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"parent(X, {child})"))
-        
-        if results:
-            parents = list(set([result['X'].capitalize() for result in results]))
-            parents.sort()
-            print(f"The parents of {child.capitalize()} are: {', '.join(parents)}.")
-        else:
-            print(f"I don't know the parents of {child.capitalize()}.")
-
-    def _process_who_daughters_question(self, question):
-        """Process 'Who are the daughters of [Name]?' question."""
-        parent = question.replace("Who are the daughters of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"daughter(X, {parent})"))
-        
-        if results:
-            daughters = list(set([result['X'].capitalize() for result in results]))
-            daughters.sort()
-            print(f"The daughters of {parent.capitalize()} are: {', '.join(daughters)}.")
-        else:
-            print(f"I don't know the daughters of {parent.capitalize()}.")
-
-    def _process_who_sons_question(self, question):
-        """Process 'Who are the sons of [Name]?' question."""
-        parent = question.replace("Who are the sons of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"son(X, {parent})"))
-        
-        if results:
-            sons = list(set([result['X'].capitalize() for result in results]))
-            sons.sort()
-            print(f"The sons of {parent.capitalize()} are: {', '.join(sons)}.")
-        else:
-            print(f"I don't know the sons of {parent.capitalize()}.")
-
-    def _process_who_children_question(self, question):
-        """Process 'Who are the children of [Name]?' question."""
-        parent = question.replace("Who are the children of ", "").replace("?", "").strip().lower()
-        results = list(self.prolog_engine.query(f"parent({parent}, X)"))
-        
-        if results:
-            children = list(set([result['X'].capitalize() for result in results]))
-            children.sort()
-            print(f"The children of {parent.capitalize()} are: {', '.join(children)}.")
-        else:
-            print(f"I don't know the children of {parent.capitalize()}.")
-
-    def start_conversation(self):
-        """
-        Start the main conversation loop for the chatbot.
-        """
-        print("\n------------------------------------------------------")
-        print("|Hello there! This is the Family Relationship Chatbot|")
-        print("------------------------------------------------------\n")
-        print("Feel free to tell me statements or ask questions about family relationships. I will be happy to assist you:>\n")
-        print("If you don't want to continue anymore, just enter 'quit' or 'exit' to end the conversation.")
-        print()
-        
-        while True:
-            user_input = input("\n> ").strip()
-            
-            if user_input.lower() in ["quit", "exit"]:
-                print("Byebye:<")
-                break
-            elif "?" in user_input:
-                self.process_question(user_input)
-            else:
-                self.process_statement(user_input)
-
-if __name__ == "__main__":
-    chatbot = FamilyRelationshipChatbot("chat.pl")
-    chatbot.start_conversation()
+import os
+import re
+import sys
+from collections import namedtuple
+
+from pyswip import Prolog
+
+class NameRef:
+    """
+    A name split into its two forms: 'lo' is the lowercase Prolog atom and
+    'disp' is the capitalized display form. Both are computed once per name so
+    the hot paths never re-run .lower()/.capitalize() on the same string.
+    Slots keep the many cached instances dict-free.
+    """
+
+    __slots__ = ('lo', 'disp')
+
+    def __init__(self, lo, disp):
+        self.lo = lo
+        self.disp = disp
+
+# Declarative description of a two-name relationship statement: the gender
+# implied for the first name (or None), the facts to assert as
+# (predicate, role...) tuples with roles 'a'/'b' for the two names, and which
+# consistency validator applies ('circular', 'parent_child' or 'sibling').
+_StatementSpec = namedtuple('_StatementSpec', ['gender', 'facts', 'validator'])
+
+def _build_question_dispatch(patterns, relation_words):
+    """
+    Group question patterns by a (first word, relation word) key.
+
+    Both parts of the key can be read off a question with one cheap scan, so
+    dispatch jumps straight to the one or two candidate patterns instead of
+    trying every form in order.
+
+    Args:
+        patterns (list): (compiled pattern, action) pairs
+        relation_words (frozenset): Relation tokens that may appear in a form
+
+    Returns:
+        dict: (first word, relation word) -> list of candidate pairs
+    """
+    dispatch = {}
+    for pattern, action in patterns:
+        words = re.findall(r"[a-z]+", pattern.pattern.lower())
+        key = (words[0], next(word for word in words if word in relation_words))
+        dispatch.setdefault(key, []).append((pattern, action))
+    return dispatch
+
+def _create_prolog_engine():
+    """
+    Create the Prolog engine selected by the PROLOG_BACKEND environment
+    variable (default 'swi'). Only the SWI-Prolog backend via pyswip ships
+    here; this factory is the single seam where a faster engine such as YAP
+    could be wired in without touching the chatbot itself.
+
+    Returns:
+        Prolog: The engine instance to consult the knowledge base into
+    """
+    backend = os.environ.get("PROLOG_BACKEND", "swi").lower()
+    if backend in ("swi", "swipl", "swi-prolog"):
+        return Prolog()
+    raise ValueError(f"Unsupported Prolog backend '{backend}'; only 'swi' is available.")
+
+class FamilyRelationshipChatbot:
+    """
+    A conversational chatbot that understands family relationships using Prolog inference.
+    Follows the exact specifications for family relationship statements and questions.
+    """
+
+    # Fixed attribute layout: the instance lives for the whole session and its
+    # attributes are read on every query, so slots save the per-instance dict
+    # and make each attribute access a fixed-offset load.
+    __slots__ = ('prolog_engine', '_engine_query', '_out_buffer')
+
+    # Lazily created engine shared by all instances; see __init__.
+    _shared_engine = None
+
+    # The engine is shared, so everything mirroring its knowledge base is
+    # class-level too: facts asserted through one instance stay visible, and
+    # cache invalidation stays effective, for every other instance. Keeping
+    # these per-instance would let a second instance 'disprove' facts it
+    # never saw asserted.
+    #
+    # Memo tables for provability checks and who-question answer sets,
+    # cleared whenever the knowledge base changes.
+    _query_cache = {}
+    _answer_cache = {}
+    # Shadow index of every asserted fact (predicate -> set of argument
+    # tuples), so flat membership checks never cross into the engine.
+    _fact_index = {}
+    # Adjacency views of the parent/2 relation plus recorded genders, serving
+    # single-hop who-questions with plain dict lookups.
+    _children = {}
+    _parents = {}
+    _gender = {}
+    # Every name appearing in a relational fact; anyone outside this set
+    # cannot be related to anybody.
+    _known_names = set()
+    # Pure string caches: assembled fact/goal text, normalized names and
+    # display forms. Independent of knowledge-base state, never invalidated.
+    _fact_strings = {}
+    _goal_strings = {}
+    _name_cache = {}
+    _display_name = {}
+
+    # A single name token in a statement; normalization happens in the handlers.
+    _NAME = r"[A-Za-z]+"
+
+    # Splits the name list of a multiple-children statement in a single pass,
+    # instead of a replace() pass followed by a split() pass.
+    _CHILDREN_SPLIT = re.compile(r", | and ")
+
+    # Upper bound on the normalized-name cache; the cache is simply dropped
+    # and rebuilt if a session somehow mentions this many distinct spellings.
+    _NAME_CACHE_LIMIT = 1024
+
+    # Shape of every fact built by _fact: predicate(atom) or predicate(atom, atom).
+    _GROUND_FACT = re.compile(r"(\w+)\((\w+)(?:, (\w+))?\)")
+
+    # Predicates that only ever hold asserted facts (no rule derives into
+    # them), so the Python-side fact index answers them both ways. Predicates
+    # with deriving rules (grandparent, pibling, ...) only short-circuit on an
+    # index hit and otherwise still go to the engine.
+    _STORED_ONLY_PREDICATES = frozenset(('parent', 'sibling_fact', 'male', 'female'))
+
+    # Bound str.format methods for goals rebuilt on every call: a single
+    # C-level call fills the holes, skipping the per-call f-string assembly.
+    _T_ONCE = "once({})".format
+    _T_ADDALL = "addall([{}])".format
+    _T_INVALID_PARENT = "(parent({0}, {1}) ; grandparent({0}, {1})), \\+ parent({1}, {0})".format
+    _T_INVALID_SIBLING = ("(parent({0}, {1}) ; parent({1}, {0}) ; "
+                          "grandparent({0}, {1}) ; grandparent({1}, {0}))").format
+
+    # Statement patterns compiled once at class-load time. Each input is matched
+    # in a single regex pass that also captures the names, instead of rescanning
+    # the statement with one substring check per supported pattern. Two-name
+    # forms all share one generic handler driven by a _StatementSpec; the
+    # three-or-more-name forms keep dedicated handlers, named by string.
+    _STATEMENT_PATTERNS = [
+        (re.compile(rf"({_NAME}) and ({_NAME}) are siblings"),
+         _StatementSpec(None, (('sibling_fact', 'a', 'b'),), 'sibling')),
+        (re.compile(rf"({_NAME}) and ({_NAME}) are the parents of ({_NAME})"),
+         "_process_parents_statement"),
+        (re.compile(rf"({_NAME}(?:, {_NAME})*(?: and {_NAME})?) are children of ({_NAME})"),
+         "_process_multiple_children_statement"),
+        (re.compile(rf"({_NAME}) is the father of ({_NAME})"),
+         _StatementSpec('male', (('parent', 'a', 'b'),), 'circular')),
+        (re.compile(rf"({_NAME}) is the mother of ({_NAME})"),
+         _StatementSpec('female', (('parent', 'a', 'b'),), 'circular')),
+        (re.compile(rf"({_NAME}) is a brother of ({_NAME})"),
+         _StatementSpec('male', (('sibling_fact', 'a', 'b'),), 'sibling')),
+        (re.compile(rf"({_NAME}) is a sister of ({_NAME})"),
+         _StatementSpec('female', (('sibling_fact', 'a', 'b'),), 'sibling')),
+        (re.compile(rf"({_NAME}) is a grandmother of ({_NAME})"),
+         _StatementSpec('female', (('grandparent', 'a', 'b'),), 'circular')),
+        (re.compile(rf"({_NAME}) is a grandfather of ({_NAME})"),
+         _StatementSpec('male', (('grandparent', 'a', 'b'),), 'circular')),
+        (re.compile(rf"({_NAME}) is a child of ({_NAME})"),
+         _StatementSpec(None, (('parent', 'b', 'a'),), 'parent_child')),
+        (re.compile(rf"({_NAME}) is a daughter of ({_NAME})"),
+         _StatementSpec('female', (('parent', 'b', 'a'),), 'parent_child')),
+        (re.compile(rf"({_NAME}) is a son of ({_NAME})"),
+         _StatementSpec('male', (('parent', 'b', 'a'),), 'parent_child')),
+        (re.compile(rf"({_NAME}) is an aunt of ({_NAME})"),
+         _StatementSpec('female', (('pibling', 'a', 'b'),), 'circular')),
+        (re.compile(rf"({_NAME}) is an uncle of ({_NAME})"),
+         _StatementSpec('male', (('pibling', 'a', 'b'),), 'circular')),
+    ]
+
+    # Question patterns, compiled once at class-load time like the statement
+    # patterns: one fullmatch per form both dispatches and captures the names,
+    # replacing the old chain of substring checks and replace() passes. Yes/no
+    # forms that reduce to a single predicate check are described as
+    # (predicate, role...) tuples with roles 'a'/'b' for the captured names;
+    # the remaining forms keep dedicated handlers, named by string.
+    _QUESTION_PATTERNS = [
+        (re.compile(rf"Are ({_NAME}) and ({_NAME}) siblings\?"), ('sibling', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) a sister of ({_NAME})\?"), ('sister', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) a brother of ({_NAME})\?"), ('brother', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) the mother of ({_NAME})\?"), ('mother', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) the father of ({_NAME})\?"), ('father', 'a', 'b')),
+        (re.compile(rf"Are ({_NAME}) and ({_NAME}) the parents of ({_NAME})\?"),
+         "_process_parents_question"),
+        (re.compile(rf"Is ({_NAME}) a grandmother of ({_NAME})\?"), ('grandmother', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) a grandfather of ({_NAME})\?"), ('grandfather', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) a daughter of ({_NAME})\?"), ('daughter', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) a son of ({_NAME})\?"), ('son', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) a child of ({_NAME})\?"), ('parent', 'b', 'a')),
+        (re.compile(rf"Are ({_NAME}(?:, {_NAME})*(?: and {_NAME})?) children of ({_NAME})\?"),
+         "_process_multiple_children_question"),
+        (re.compile(rf"Is ({_NAME}) an aunt of ({_NAME})\?"), ('aunt', 'a', 'b')),
+        (re.compile(rf"Is ({_NAME}) an uncle of ({_NAME})\?"), ('uncle', 'a', 'b')),
+        (re.compile(rf"Are ({_NAME}) and ({_NAME}) relatives\?"), "_process_relatives_question"),
+        (re.compile(rf"Who are the siblings of ({_NAME})\?"), "_process_who_siblings_question"),
+        (re.compile(rf"Who are the sisters of ({_NAME})\?"), "_process_who_sisters_question"),
+        (re.compile(rf"Who are the brothers of ({_NAME})\?"), "_process_who_brothers_question"),
+        (re.compile(rf"Who is the mother of ({_NAME})\?"), "_process_who_mother_question"),
+        (re.compile(rf"Who is the father of ({_NAME})\?"), "_process_who_father_question"),
+        (re.compile(rf"Who are the parents of ({_NAME})\?"), "_process_who_parents_question"),
+        (re.compile(rf"Who are the daughters of ({_NAME})\?"), "_process_who_daughters_question"),
+        (re.compile(rf"Who are the sons of ({_NAME})\?"), "_process_who_sons_question"),
+        (re.compile(rf"Who are the children of ({_NAME})\?"), "_process_who_children_question"),
+    ]
+
+    # Lowercase word tokens of a question, used to build its dispatch key.
+    _QUESTION_WORDS = re.compile(r"[a-z]+")
+
+    # Relation tokens that identify a question form together with its first
+    # word; a name that happens to spell one of these only costs a fallback
+    # scan over the full pattern table.
+    _RELATION_WORDS = frozenset((
+        'siblings', 'sister', 'sisters', 'brother', 'brothers', 'mother',
+        'father', 'parents', 'grandmother', 'grandfather', 'daughter',
+        'daughters', 'son', 'sons', 'child', 'children', 'aunt', 'uncle',
+        'relatives',
+    ))
+
+    _QUESTION_DISPATCH = _build_question_dispatch(_QUESTION_PATTERNS, _RELATION_WORDS)
+
+    def __init__(self, knowledge_base_file):
+        """
+        Initialize the chatbot with a Prolog knowledge base.
+        
+        Args:
+            knowledge_base_file (str): Path to the Prolog knowledge base file
+        """
+        # One engine is shared by every chatbot in the process, so the
+        # knowledge base is consulted once and its facts, rule compilation
+        # and tables stay warm across instances. The shared engine also means
+        # instances see each other's asserted facts; SWI-Prolog itself only
+        # supports a single Prolog instance per process anyway.
+        engine = FamilyRelationshipChatbot._shared_engine
+        if engine is None:
+            engine = _create_prolog_engine()
+            # Prefer a precompiled knowledge base when one sits next to the
+            # source: loading a .qlf skips the parse/compile pass on startup.
+            # Generate it with: swipl -g "qcompile('chat.pl')" -t halt
+            compiled_kb = os.path.splitext(knowledge_base_file)[0] + ".qlf"
+            if os.path.exists(compiled_kb):
+                knowledge_base_file = compiled_kb
+            engine.consult(knowledge_base_file)
+            FamilyRelationshipChatbot._shared_engine = engine
+        self.prolog_engine = engine
+        # Bound once so hot paths skip the attribute chain on every query.
+        self._engine_query = engine.query
+        # Collects output lines while piped input is processed in batch mode;
+        # None means interactive mode, where lines are printed immediately.
+        self._out_buffer = None
+
+    def _assert_facts(self, facts):
+        """
+        Assert new facts into the knowledge base and invalidate cached query
+        results, since the new facts may change what is provable. All facts
+        are handed to the addall/1 helper in chat.pl so a whole statement
+        costs one engine call instead of one call per fact.
+
+        Args:
+            facts (list): Prolog fact strings to assert
+        """
+        facts = list(facts)
+        new_parents = []
+        fullmatch = self._GROUND_FACT.fullmatch
+        fact_index = self._fact_index
+        known_names = self._known_names
+        for fact in facts:
+            match = fullmatch(fact)
+            predicate = match.group(1)
+            arguments = match.group(2, 3) if match.group(3) else (match.group(2),)
+            fact_index.setdefault(predicate, set()).add(arguments)
+            known_names.update(arguments)
+            if predicate == 'parent':
+                new_parents.append(arguments)
+                parent, child = arguments
+                self._children.setdefault(parent, set()).add(child)
+                self._parents.setdefault(child, set()).add(parent)
+        if new_parents:
+            facts.extend(self._derived_grandparent_facts(new_parents))
+        list(self._engine_query(self._T_ADDALL(', '.join(facts))))
+        # Tabled predicates memoize answers inside the engine; flush them at
+        # the same point the Python-side memo table is invalidated.
+        list(self._engine_query("abolish_all_tables"))
+        self._query_cache.clear()
+        self._answer_cache.clear()
+
+    def _derived_grandparent_facts(self, new_parents):
+        """
+        Precompute the grandparent pairs created by a batch of parent facts.
+
+        Parents are only ever added, never retracted, so each pair is derived
+        once at write time; grandparent checks then resolve as fact-index hits
+        instead of a double parent join in the engine on every query.
+
+        Args:
+            new_parents (list): (parent, child) tuples asserted in this batch
+
+        Returns:
+            list: Grandparent fact strings to assert alongside the batch
+        """
+        parent_pairs = self._fact_index.get('parent', ())
+        grandparents = self._fact_index.setdefault('grandparent', set())
+        derived = []
+        for parent, child in new_parents:
+            pairs = {(grandparent, child)
+                     for grandparent, middle in parent_pairs if middle == parent}
+            pairs.update((parent, grandchild)
+                         for middle, grandchild in parent_pairs if middle == child)
+            for pair in pairs:
+                if pair[0] != pair[1] and pair not in grandparents:
+                    grandparents.add(pair)
+                    derived.append(self._fact("grandparent", *pair))
+        return derived
+
+    def _fact(self, predicate, *arguments):
+        """
+        Build the Prolog text for a predicate applied to lowercase atoms.
+
+        Args:
+            predicate (str): Predicate name
+            *arguments (str): Lowercase atom arguments
+
+        Returns:
+            str: The assembled fact string, cached per combination
+        """
+        key = (predicate,) + arguments
+        fact = self._fact_strings.get(key)
+        if fact is None:
+            fact = f"{predicate}({', '.join(arguments)})"
+            self._fact_strings[key] = fact
+        return fact
+
+    def _goal(self, template, atom):
+        """
+        Fill a query template with one atom, reusing the assembled string.
+
+        pyswip offers no prepared-query handle, so the goal text itself is
+        the closest thing to one; caching it per (template, atom) pair means
+        repeat questions hand the engine the identical string object.
+
+        Args:
+            template (str): Goal template with a single {} placeholder
+            atom (str): Lowercase atom to substitute
+
+        Returns:
+            str: The assembled goal string, cached per combination
+        """
+        key = (template, atom)
+        goal = self._goal_strings.get(key)
+        if goal is None:
+            goal = template.format(atom)
+            self._goal_strings[key] = goal
+        return goal
+
+    def _make_name(self, raw_name):
+        """
+        Normalize a raw name into a NameRef.
+
+        Args:
+            raw_name (str): Name as it appeared in the user's input
+
+        Returns:
+            NameRef: The lowercase atom and capitalized display forms
+        """
+        name = self._name_cache.get(raw_name)
+        if name is None:
+            if len(self._name_cache) >= self._NAME_CACHE_LIMIT:
+                self._name_cache.clear()
+            # Interned atoms make the dict/set probes on the hot paths
+            # pointer comparisons instead of character-by-character ones.
+            atom = sys.intern(raw_name.lower())
+            name = NameRef(atom, atom.capitalize())
+            self._name_cache[raw_name] = name
+            self._display_name.setdefault(atom, name.disp)
+        return name
+
+    def _is_fact_provable(self, fact_query):
+        """
+        Check if a fact can be proven from the current knowledge base.
+        
+        Args:
+            fact_query (str): Prolog query to check
+            
+        Returns:
+            bool: True if the fact is provable, False otherwise
+        """
+        cached = self._query_cache.get(fact_query)
+        if cached is not None:
+            return cached
+        # Ground single-predicate queries are first checked against the
+        # Python-side fact index: a hit is proof, and for predicates no rule
+        # derives into, a miss is disproof - either way the engine is skipped.
+        match = self._GROUND_FACT.fullmatch(fact_query)
+        if match:
+            predicate = match.group(1)
+            arguments = match.group(2, 3) if match.group(3) else (match.group(2),)
+            if arguments in self._fact_index.get(predicate, ()):
+                return True
+            if predicate in self._STORED_ONLY_PREDICATES:
+                return False
+        # Only truthiness is needed, so stop resolution at the first solution
+        # instead of materializing every answer with list(...). The generator
+        # is closed explicitly because pyswip keeps a Prolog frame open until
+        # the query is exhausted or closed. No blanket exception guard here:
+        # every query reaching this point is assembled from atoms the dispatch
+        # patterns already validated, and the top-level statement/question
+        # handlers still catch anything unexpected.
+        solutions = self._engine_query(fact_query)
+        try:
+            next(solutions)
+            result = True
+        except StopIteration:
+            result = False
+        finally:
+            solutions.close()
+        self._query_cache[fact_query] = result
+        return result
+
+    def _display(self, atom):
+        """
+        Map a Prolog atom back to its display form.
+
+        Args:
+            atom (str): Lowercase atom from a query result
+
+        Returns:
+            str: The cached display form, or a fresh capitalization for an
+                atom that never passed through _make_name
+        """
+        return self._display_name.get(atom) or atom.capitalize()
+
+    def _query_all(self, goal):
+        """
+        Run a goal over one free variable X and collect every binding for it.
+
+        Answers are memoized alongside the provability memo table and
+        invalidated at the same points, so repeating a who-question is a dict
+        lookup instead of another engine round trip. Solutions are streamed
+        straight into a set, so duplicate answers from untabled goals never
+        pile up in an intermediate list.
+
+        Args:
+            goal (str): Prolog goal with a single free variable named X
+
+        Returns:
+            tuple: The distinct atoms bound to X, in sorted order
+        """
+        answers = self._answer_cache.get(goal)
+        if answers is None:
+            seen = set()
+            for solution in self._engine_query(goal):
+                seen.add(solution['X'])
+            answers = tuple(sorted(seen))
+            self._answer_cache[goal] = answers
+        return answers
+
+    def _try_assert_gender(self, person_name, gender):
+        """
+        Check and record a person's gender in a single Prolog call.
+
+        Args:
+            person_name (str): Lowercase atom of the person's name
+            gender (str): 'male' or 'female'
+
+        Returns:
+            bool: True if the gender is consistent (and now recorded),
+                False if it conflicts with the opposite gender
+        """
+        # Runs outside the provability memo table because it can mutate the
+        # knowledge base; on success the caches are invalidated like after
+        # any other assert.
+        solutions = self._engine_query(self._fact("safe_assert_gender", person_name, gender))
+        try:
+            succeeded = next(solutions, None) is not None
+        finally:
+            solutions.close()
+        if succeeded:
+            self._fact_index.setdefault(gender, set()).add((person_name,))
+            self._gender[person_name] = gender
+            list(self._engine_query("abolish_all_tables"))
+            self._query_cache.clear()
+            self._answer_cache.clear()
+        return succeeded
+
+    def _are_persons_related(self, person1, person2):
+        """
+        Check if two persons are already related in the knowledge base.
+        
+        Args:
+            person1 (str): First person's name as a lowercase atom
+            person2 (str): Second person's name as a lowercase atom
+            
+        Returns:
+            bool: True if they are related, False otherwise
+        """
+        # A name that appears in no relational fact cannot be related to
+        # anyone: answer those lookups with a set probe instead of a full
+        # transitive-closure search.
+        known_names = self._known_names
+        if person1 not in known_names or person2 not in known_names:
+            return False
+        # related/2 is tabled in chat.pl, so the closure walk is memoized in
+        # the engine; once/1 stops it at the first proof instead of leaving
+        # choicepoints over the remaining relationship alternatives.
+        goal = self._fact("related", person1, person2)
+        return self._is_fact_provable(self._T_ONCE(goal))
+
+    def _would_create_circular_relationship(self, child, parent):
+        """
+        Check if a parent-child relationship would create circular dependency.
+        
+        Args:
+            child (str): Child's name as a lowercase atom
+            parent (str): Parent's name as a lowercase atom
+            
+        Returns:
+            bool: True if it would create circular relationship, False otherwise
+        """
+        # Check if parent is already a descendant of child
+        return self._are_persons_related(parent, child)
+
+    def _would_create_invalid_parent_child_relationship(self, child, parent):
+        """
+        Check if a parent-child relationship would create logical inconsistencies.
+        This is more specific than circular relationship check - it allows consistent
+        assertions but prevents true logical conflicts.
+        
+        Args:
+            child (str): Child's name as a lowercase atom
+            parent (str): Parent's name as a lowercase atom
+            
+        Returns:
+            bool: True if it would create invalid relationship, False otherwise
+        """
+        # Invalid only if the child is already an ancestor of the proposed
+        # parent and they are not already parent and child. One disjunctive
+        # query lets Prolog short-circuit instead of three separate queries.
+        return self._is_fact_provable(self._T_INVALID_PARENT(child, parent))
+
+    def _would_create_invalid_sibling_relationship(self, person1, person2):
+        """
+        Check if a sibling relationship would create logical inconsistencies.
+        For siblings, we only check for direct ancestor-descendant relationships,
+        not general relatedness (since siblings can be related in other ways).
+        
+        Args:
+            person1 (str): First person's name as a lowercase atom
+            person2 (str): Second person's name as a lowercase atom
+            
+        Returns:
+            bool: True if it would create invalid relationship, False otherwise
+        """
+        # Invalid if one is an ancestor/descendant of the other. Fused into a
+        # single disjunctive query so only one engine round trip is needed and
+        # resolution stops at the first alternative that succeeds.
+        return self._is_fact_provable(self._T_INVALID_SIBLING(person1, person2))
+
+    def _validate_multiple_children_statement(self, children_list, parent_name):
+        """
+        Validate that multiple children can be children of the given parent.
+        
+        Args:
+            children_list (list): List of children NameRefs
+            parent_name (NameRef): Parent's name
+            
+        Returns:
+            bool: True if valid, False if conflicts exist
+        """
+        for child in children_list:
+            if (child.lo == parent_name.lo or
+                self._would_create_circular_relationship(child.lo, parent_name.lo)):
+                return False
+        return True
+
+    def process_statement(self, user_statement):
+        """
+        Process a user statement and update the knowledge base if valid.
+        
+        Args:
+            user_statement (str): The statement provided by the user
+        """
+        statement = user_statement.strip().rstrip('.').strip()
+
+        try:
+            # Single pass over the precompiled patterns; the first match also
+            # captures the names, so handlers no longer re-parse the statement.
+            for pattern, action in self._STATEMENT_PATTERNS:
+                match = pattern.fullmatch(statement)
+                if match:
+                    if isinstance(action, _StatementSpec):
+                        self._process_relationship_statement(action, *match.groups())
+                    else:
+                        getattr(self, action)(*match.groups())
+                    return
+
+            self._emit("Invalid statement. Please follow the sentence patterns.")
+
+        except Exception:
+            self._emit("That's impossible!")
+
+    def _process_parents_statement(self, first_parent, second_parent, child_name):
+        """Process '[Name] and [Name] are the parents of [Name]' statement."""
+        parent1 = self._make_name(first_parent)
+        parent2 = self._make_name(second_parent)
+        child = self._make_name(child_name)
+
+        # Validation checks
+        if (child.lo == parent1.lo or child.lo == parent2.lo or
+            self._would_create_circular_relationship(child.lo, parent1.lo) or
+            self._would_create_circular_relationship(child.lo, parent2.lo)):
+            self._emit("That's impossible!")
+            return
+
+        self._assert_facts([self._fact("parent", parent1.lo, child.lo),
+                            self._fact("parent", parent2.lo, child.lo)])
+        self._emit("OK! I learned something.")
+
+    def _process_multiple_children_statement(self, children_part, parent_name):
+        """Process '[Name], [Name] and [Name] are children of [Name]' statement."""
+        parts = self._CHILDREN_SPLIT.split(children_part)
+        children = [self._make_name(child) for child in parts]
+        parent = self._make_name(parent_name)
+
+        if not self._validate_multiple_children_statement(children, parent):
+            self._emit("That's impossible!")
+            return
+
+        self._assert_facts([self._fact("parent", parent.lo, child.lo)
+                            for child in children])
+        self._emit("OK! I learned something.")
+
+    def _process_relationship_statement(self, spec, first_name, second_name):
+        """
+        Process any two-name relationship statement according to its spec.
+
+        Args:
+            spec (_StatementSpec): Declarative description of the statement form
+            first_name (str): First captured name
+            second_name (str): Second captured name
+        """
+        first = self._make_name(first_name)
+        second = self._make_name(second_name)
+
+        if (first.lo == second.lo or
+            self._would_create_invalid_relationship(spec.validator, first.lo, second.lo)):
+            self._emit("That's impossible!")
+            return
+
+        # Gender is checked and recorded in one engine call; failure means the
+        # statement conflicts with an already known gender.
+        if spec.gender is not None and not self._try_assert_gender(first.lo, spec.gender):
+            self._emit("That's impossible!")
+            return
+
+        names = {'a': first.lo, 'b': second.lo}
+        self._assert_facts([self._fact(predicate, *(names[role] for role in roles))
+                            for predicate, *roles in spec.facts])
+        self._emit("OK! I learned something.")
+
+    def _would_create_invalid_relationship(self, validator, first, second):
+        """
+        Run the consistency validator named by a _StatementSpec.
+
+        Args:
+            validator (str): 'circular', 'parent_child' or 'sibling'
+            first (str): First name as a lowercase atom
+            second (str): Second name as a lowercase atom
+
+        Returns:
+            bool: True if asserting the relationship would be inconsistent
+        """
+        if validator == 'circular':
+            return self._would_create_circular_relationship(second, first)
+        if validator == 'parent_child':
+            return self._would_create_invalid_parent_child_relationship(first, second)
+        return self._would_create_invalid_sibling_relationship(first, second)
+
+
+    def process_question(self, user_question):
+        """
+        Process a user question and provide an appropriate answer.
+        
+        Args:
+            user_question (str): The question provided by the user
+        """
+        question = user_question.strip()
+
+        try:
+            # The (first word, relation word) key narrows dispatch to the one
+            # or two candidate forms sharing it, so most questions try a
+            # single fullmatch instead of scanning the whole pattern table.
+            words = self._QUESTION_WORDS.findall(question.lower())
+            relation = next((word for word in words if word in self._RELATION_WORDS), None)
+            candidates = self._QUESTION_DISPATCH.get((words[0], relation), ()) if words else ()
+            for pattern, action in candidates:
+                match = pattern.fullmatch(question)
+                if match:
+                    self._run_question_action(action, match.groups())
+                    return
+
+            # Fallback full scan keeps behavior intact when the key misses,
+            # e.g. when a captured name itself spells a relation word.
+            for pattern, action in self._QUESTION_PATTERNS:
+                match = pattern.fullmatch(question)
+                if match:
+                    self._run_question_action(action, match.groups())
+                    return
+
+            self._emit("Invalid question. Please follow the sentence patterns.")
+
+        except Exception:
+            self._emit("Invalid question. Please follow the sentence patterns.")
+
+    def _run_question_action(self, action, groups):
+        """
+        Invoke the handler a question pattern is mapped to.
+
+        Args:
+            action: (predicate, role...) tuple or handler method name
+            groups (tuple): Names captured by the matched pattern
+        """
+        if isinstance(action, tuple):
+            self._process_binary_question(action, *groups)
+        else:
+            getattr(self, action)(*groups)
+
+    def _process_binary_question(self, spec, first_name, second_name):
+        """
+        Answer any yes/no question that reduces to one predicate check.
+
+        Args:
+            spec (tuple): (predicate, role...) with roles 'a'/'b' for the names
+            first_name (str): First captured name
+            second_name (str): Second captured name
+        """
+        predicate, *roles = spec
+        names = {'a': self._make_name(first_name).lo, 'b': self._make_name(second_name).lo}
+        result = self._is_fact_provable(self._fact(predicate, *(names[role] for role in roles)))
+        self._emit("Yes!" if result else "No!")
+
+    def _process_relatives_question(self, first_name, second_name):
+        """Process 'Are [Name] and [Name] relatives?' question."""
+        first = self._make_name(first_name)
+        second = self._make_name(second_name)
+        # Goes through _are_persons_related rather than a bare related/2
+        # check so unknown names are answered without an engine query and
+        # known pairs get the once/1-wrapped tabled goal.
+        result = self._are_persons_related(first.lo, second.lo)
+        self._emit("Yes!" if result else "No!")
+
+    def _process_parents_question(self, first_parent, second_parent, child_name):
+        """Process 'Are [Name] and [Name] the parents of [Name]?' question."""
+        parent1 = self._make_name(first_parent)
+        parent2 = self._make_name(second_parent)
+        child = self._make_name(child_name)
+
+        result = (self._is_fact_provable(self._fact("parent", parent1.lo, child.lo)) and
+                  self._is_fact_provable(self._fact("parent", parent2.lo, child.lo)))
+        self._emit("Yes!" if result else "No!")
+
+    def _process_multiple_children_question(self, children_part, parent_name):
+        """Process 'Are [Name], [Name] and [Name] children of [Name]?' question."""
+        children = [self._make_name(child) for child in self._CHILDREN_SPLIT.split(children_part)]
+        parent = self._make_name(parent_name)
+
+        # parent/2 is stored-only, so the whole conjunction collapses to set
+        # membership against the fact index: one short-circuiting scan with no
+        # engine round trip per child.
+        parent_pairs = self._fact_index.get('parent', ())
+        all_children = all((parent.lo, child.lo) in parent_pairs for child in children)
+        self._emit("Yes!" if all_children else "No!")
+
+    def _process_who_siblings_question(self, person_name):
+        """Process 'Who are the siblings of [Name]?' question."""
+        person = self._make_name(person_name)
+        results = self._query_all(self._goal("sibling(X, {})", person.lo))
+
+        if results:
+            # _query_all already deduped and sorted the atoms
+            siblings = [self._display(atom) for atom in results]
+            self._emit(f"The siblings of {person.disp} are: {', '.join(siblings)}.")
+        else:
+            self._emit(f"I don't know the siblings of {person.disp}.")
+
+    def _process_who_sisters_question(self, person_name):
+        """Process 'Who are the sisters of [Name]?' question."""
+        person = self._make_name(person_name)
+        results = self._query_all(self._goal("sister(X, {})", person.lo))
+
+        if results:
+            # _query_all already deduped and sorted the atoms
+            sisters = [self._display(atom) for atom in results]
+            self._emit(f"The sisters of {person.disp} are: {', '.join(sisters)}.")
+        else:
+            self._emit(f"I don't know the sisters of {person.disp}.")
+
+    def _process_who_brothers_question(self, person_name):
+        """Process 'Who are the brothers of [Name]?' question."""
+        person = self._make_name(person_name)
+        results = self._query_all(self._goal("brother(X, {})", person.lo))
+
+        if results:
+            # _query_all already deduped and sorted the atoms
+            brothers = [self._display(atom) for atom in results]
+            self._emit(f"The brothers of {person.disp} are: {', '.join(brothers)}.")
+        else:
+            self._emit(f"I don't know the brothers of {person.disp}.")
+
+    def _process_who_mother_question(self, child_name):
+        """Process 'Who is the mother of [Name]?' question."""
+        child = self._make_name(child_name)
+        # Single hop through the adjacency indexes; no engine call needed.
+        mother = next((parent for parent in self._parents.get(child.lo, ())
+                       if self._gender.get(parent) == 'female'), None)
+
+        if mother is not None:
+            self._emit(f"The mother of {child.disp} is {self._display(mother)}.")
+        else:
+            self._emit(f"I don't know who the mother of {child.disp} is.")
+
+    def _process_who_father_question(self, child_name):
+        """Process 'Who is the father of [Name]?' question."""
+        child = self._make_name(child_name)
+        # Single hop through the adjacency indexes; no engine call needed.
+        father = next((parent for parent in self._parents.get(child.lo, ())
+                       if self._gender.get(parent) == 'male'), None)
+
+        if father is not None:
+            self._emit(f"The father of {child.disp} is {self._display(father)}.")
+        else:
+            self._emit(f"I don't know who the father of {child.disp} is.")
+
+    def _process_who_parents_question(self, person_name):
+        """Process 'Who are the parents of [Name]?' question."""
+        person = self._make_name(person_name)
+        # Single hop through the adjacency indexes; no engine call needed.
+        results = self._parents.get(person.lo)
+
+        if results:
+            parents = sorted(self._display(atom) for atom in results)
+            self._emit(f"The parents of {person.disp} are: {', '.join(parents)}.")
+        else:
+            self._emit(f"I don't know the parents of {person.disp}.")
+
+    def _process_who_daughters_question(self, person_name):
+        """Process 'Who are the daughters of [Name]?' question."""
+        person = self._make_name(person_name)
+        # One hop plus a gender filter, both served from the Python-side
+        # indexes; genders only ever enter through safe_assert_gender, so
+        # the _gender dict is as complete as the engine's female/1 facts.
+        results = [child for child in self._children.get(person.lo, ())
+                   if self._gender.get(child) == 'female']
+
+        if results:
+            daughters = sorted(self._display(atom) for atom in results)
+            self._emit(f"The daughters of {person.disp} are: {', '.join(daughters)}.")
+        else:
+            self._emit(f"I don't know the daughters of {person.disp}.")
+
+    def _process_who_sons_question(self, person_name):
+        """Process 'Who are the sons of [Name]?' question."""
+        person = self._make_name(person_name)
+        # One hop plus a gender filter, both served from the Python-side
+        # indexes; genders only ever enter through safe_assert_gender, so
+        # the _gender dict is as complete as the engine's male/1 facts.
+        results = [child for child in self._children.get(person.lo, ())
+                   if self._gender.get(child) == 'male']
+
+        if results:
+            sons = sorted(self._display(atom) for atom in results)
+            self._emit(f"The sons of {person.disp} are: {', '.join(sons)}.")
+        else:
+            self._emit(f"I don't know the sons of {person.disp}.")
+
+    def _process_who_children_question(self, person_name):
+        """Process 'Who are the children of [Name]?' question."""
+        person = self._make_name(person_name)
+        # Single hop through the adjacency indexes; no engine call needed.
+        results = self._children.get(person.lo)
+
+        if results:
+            children = sorted(self._display(atom) for atom in results)
+            self._emit(f"The children of {person.disp} are: {', '.join(children)}.")
+        else:
+            self._emit(f"I don't know the children of {person.disp}.")
+
+    def _emit(self, text):
+        """
+        Deliver one line of chatbot output.
+
+        Args:
+            text (str): The line to show the user
+        """
+        # Interactive mode prints straight away; batch mode buffers so the
+        # whole run costs a single write at the end.
+        if self._out_buffer is None:
+            print(text)
+        else:
+            self._out_buffer.append(text)
+
+    def _dispatch(self, user_input):
+        """
+        Route one input line to the statement or question processor.
+
+        Args:
+            user_input (str): Stripped line of user input
+        """
+        if "?" in user_input:
+            self.process_question(user_input)
+        else:
+            self.process_statement(user_input)
+
+    def start_conversation(self):
+        """
+        Start the main conversation loop for the chatbot. When stdin is not a
+        terminal the whole input is processed as a batch: no banner or
+        prompts, and all answers are flushed in one write at the end.
+        """
+        if not sys.stdin.isatty():
+            self._out_buffer = []
+            for line in sys.stdin:
+                user_input = line.strip()
+                if user_input.lower() in ["quit", "exit"]:
+                    break
+                self._dispatch(user_input)
+            output = self._out_buffer
+            self._out_buffer = None
+            if output:
+                sys.stdout.write("\n".join(output) + "\n")
+            return
+
+        print("\n------------------------------------------------------")
+        print("|Hello there! This is the Family Relationship Chatbot|")
+        print("------------------------------------------------------\n")
+        print("Feel free to tell me statements or ask questions about family relationships. I will be happy to assist you:>\n")
+        print("If you don't want to continue anymore, just enter 'quit' or 'exit' to end the conversation.")
+        print()
+        
+        # Pre-bound stream methods: one flushed prompt write and one readline
+        # per turn, without input()'s per-call attribute lookups.
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        readline = sys.stdin.readline
+        while True:
+            write("\n> ")
+            flush()
+            line = readline()
+            if not line:
+                break
+            user_input = line.strip()
+
+            if user_input.lower() in ["quit", "exit"]:
+                print("Byebye:<")
+                break
+            self._dispatch(user_input)
+
+if __name__ == "__main__":
+    chatbot = FamilyRelationshipChatbot("chat.pl")
+    chatbot.start_conversation()